@@ -1,21 +1,60 @@
 """App configuration."""
 
-import json
+import abc
+import asyncio
 import pathlib
-from functools import lru_cache
 from os import environ
 from typing import Any, Literal
 
 import cloai
 import fastapi
+import orjson
 import pydantic
 from cloai.llm import bedrock as cloai_bedrock
 from fastapi import status
 from openai.types import chat_model
 from pydantic import BaseModel, Field
 
+from cloaiservice.models.clients import AvailableClientsResponse, ClientInfo
+from cloaiservice.services.limiter import ConcurrencyLimiter
 
-class BedrockAnthropicConfig(BaseModel):
+
+class ClientConfig(BaseModel, abc.ABC):
+    """Configuration shared by all clients."""
+
+    max_concurrency: int = Field(
+        default=64,
+        gt=0,
+        description=(
+            "Maximum concurrent requests to the client per worker process; with "
+            "N uvicorn workers, up to N times as many requests run at once."
+        ),
+    )
+    max_pending: int = Field(
+        default=256,
+        ge=0,
+        description=(
+            "Maximum requests waiting for the client before returning 429, per "
+            "worker process."
+        ),
+    )
+
+    @abc.abstractmethod
+    def create_client(self) -> cloai.LargeLanguageModel:
+        """Create the client instance."""
+
+    @abc.abstractmethod
+    def describe(self) -> ClientInfo:
+        """Describe the client for the /clients endpoint."""
+
+    def create_limiter(self) -> ConcurrencyLimiter:
+        """Create the concurrency limiter of the client."""
+        return ConcurrencyLimiter(
+            max_concurrency=self.max_concurrency, max_pending=self.max_pending
+        )
+
+
+class BedrockAnthropicConfig(ClientConfig):
     """Bedrock Anthropic client configuration."""
 
     type: Literal["bedrock-anthropic"]
@@ -39,8 +78,12 @@ class BedrockAnthropicConfig(BaseModel):
             )
         )
 
+    def describe(self) -> ClientInfo:
+        """Describe the client for the /clients endpoint."""
+        return ClientInfo(provider="Anthropic", model=self.model, type="Bedrock")
+
 
-class OpenAIConfig(BaseModel):
+class OpenAIConfig(ClientConfig):
     """OpenAI client configuration."""
 
     type: Literal["openai"]
@@ -58,8 +101,12 @@ class OpenAIConfig(BaseModel):
             )
         )
 
+    def describe(self) -> ClientInfo:
+        """Describe the client for the /clients endpoint."""
+        return ClientInfo(provider="OpenAI", model=self.model, type="OpenAI")
 
-class AzureConfig(BaseModel):
+
+class AzureConfig(ClientConfig):
     """Azure client configuration."""
 
     type: Literal["azure"]
@@ -79,28 +126,44 @@ class AzureConfig(BaseModel):
             )
         )
 
+    def describe(self) -> ClientInfo:
+        """Describe the client for the /clients endpoint."""
+        return ClientInfo(provider="OpenAI", model=self.deployment, type="Azure")
+
+
+class ClientEntry(BaseModel):
+    """An LLM client together with its description and concurrency limiter."""
+
+    model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+
+    llm: cloai.LargeLanguageModel
+    info: ClientInfo
+    limiter: ConcurrencyLimiter
+
 
-def create_clients(
+async def create_clients(
     config: dict[str, dict[str, Any]],
-) -> dict[str, cloai.LargeLanguageModel]:
+) -> dict[str, ClientEntry]:
     """Creates the LLM clients.
 
-    This function will run for all clients, even when one fails, so that
-    all errors in the config can be returned to the user.
+    This function will validate all clients, even when one fails, so that
+    all errors in the config can be returned to the user. The clients are
+    constructed concurrently in worker threads, as provider SDKs may block
+    during initialization.
 
     Args:
         config: The JSON formatted configurations.
 
     Returns:
-        A dictionary of LLM clients.
+        A dictionary of LLM clients and their descriptions.
 
     Raises:
         500: For malformed configurations.
     """
-    clients: dict[str, cloai.LargeLanguageModel] = {}
+    client_configs: dict[str, ClientConfig] = {}
     errors = []
 
-    type_constructors = {
+    type_constructors: dict[str, type[ClientConfig]] = {
         "azure": AzureConfig,
         "bedrock-anthropic": BedrockAnthropicConfig,
         "openai": OpenAIConfig,
@@ -121,7 +184,7 @@ def create_clients(
             continue
 
         try:
-            clients[name] = type_constructors[args["type"]](**args).create_client()
+            client_configs[name] = type_constructors[args["type"]](**args)
         except pydantic.ValidationError as exc_info:
             # Report only the type and the location, as further contents may contain
             # secrets.
@@ -138,17 +201,79 @@ def create_clients(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="; ".join(errors)
         )
 
-    return clients
+    llms = await asyncio.gather(
+        *(
+            asyncio.to_thread(client_config.create_client)
+            for client_config in client_configs.values()
+        )
+    )
+    return {
+        name: ClientEntry(
+            llm=llm,
+            info=client_config.describe(),
+            limiter=client_config.create_limiter(),
+        )
+        for (name, client_config), llm in zip(client_configs.items(), llms)
+    }
+
+
+async def close_clients(clients: dict[str, ClientEntry]) -> None:
+    """Closes the HTTP connection pools of the LLM clients.
+
+    The provider SDK clients each keep a pool of keep-alive connections that
+    is reused across requests; it should be released on shutdown.
+
+    Args:
+        clients: The LLM clients.
+    """
+    for entry in clients.values():
+        sdk_client = getattr(entry.llm.client, "client", None)
+        close = getattr(sdk_client, "close", None)
+        if close is not None:
+            await close()
 
 
 class Config(pydantic.BaseModel):
-    """Service configuration."""
+    """Service configuration.
+
+    The client descriptions are serialized once, as the clients do not change
+    after startup, so that the /clients endpoint can return them without
+    serializing on every request.
+    """
+
+    model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+
+    clients: dict[str, ClientEntry]
+    client_info_json: bytes
 
-    clients: dict[str, cloai.LargeLanguageModel]
+
+_CONFIG: Config | None = None
+
+
+async def init_config() -> Config:
+    """Load the config and make it available through get_config.
+
+    This is called once on startup.
+    """
+    global _CONFIG
+    _CONFIG = await load_config()
+    return _CONFIG
 
 
-@lru_cache()
 def get_config() -> Config:
+    """Get the config loaded on startup.
+
+    Raises:
+        500: If the config has not been loaded.
+    """
+    if _CONFIG is None:
+        raise fastapi.HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR, "Config has not been loaded."
+        )
+    return _CONFIG
+
+
+async def load_config() -> Config:
     """Load config from environment or config file.
 
     Precedence:
@@ -158,15 +283,21 @@ def get_config() -> Config:
     """
     # First try loading from CONFIG_JSON environment variable
     config_path = pathlib.Path(environ.get("CONFIG_PATH", "config.json"))
-    config_json = environ.get("CONFIG_JSON")
+    config_json = environ.get("CONFIG_JSON", "").encode()
     if not config_json:
         try:
-            config_json = config_path.read_text()
+            config_json = config_path.read_bytes()
         except (FileNotFoundError, IsADirectoryError):
             raise fastapi.HTTPException(
                 status.HTTP_500_INTERNAL_SERVER_ERROR,
                 "Config file not found and CONFIG_JSON environment variable not set.",
             )
 
-    clients = create_clients(json.loads(config_json))
-    return Config(clients=clients)
+    clients = await create_clients(orjson.loads(config_json))
+    client_info = AvailableClientsResponse(
+        clients={name: entry.info for name, entry in clients.items()}
+    )
+    return Config(
+        clients=clients,
+        client_info_json=client_info.model_dump_json().encode(),
+    )
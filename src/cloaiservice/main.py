@@ -1,15 +1,31 @@
 """App entrypoint."""
 
-from fastapi import APIRouter, FastAPI
+import contextlib
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, FastAPI, Request, status
+from fastapi.responses import JSONResponse
 
 from cloaiservice import config
 from cloaiservice.routes import clients, health, llm
 
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Loads the config on startup and closes the client connections on shutdown."""
+    app_config = await config.init_config()
+    # The OpenAPI schema is generated on first use; build it before serving so
+    # that the first request to the docs doesn't pay for it.
+    app.openapi()
+    yield
+    await config.close_clients(app_config.clients)
+
+
 app = FastAPI(
     title="cloai API Service",
     description="API service for interacting with various LLM providers",
     version="0.1.0",
-    on_startup=[config.get_config],  # Ensure that the config is correct on startup
+    lifespan=lifespan,
 )
 
 version_router = APIRouter(prefix="/v1")
@@ -17,3 +33,11 @@ version_router.include_router(clients.router, prefix="/clients", tags=["clients"
 version_router.include_router(llm.router, prefix="/llm", tags=["llm"])
 version_router.include_router(health.router, prefix="/health", tags=["health"])
 app.include_router(version_router)
+
+
+@app.exception_handler(Exception)
+async def handle_exception(request: Request, exc: Exception) -> JSONResponse:
+    """Reports unhandled errors, e.g. from the LLM providers, as internal errors."""
+    return JSONResponse(
+        {"detail": str(exc)}, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+    )
@@ -2,9 +2,7 @@
 
 from typing import Any, Self
 
-import fastapi
 import pydantic
-from fastapi import status
 from pydantic import BaseModel, Field
 
 
@@ -22,6 +20,24 @@ class InstructorRequest(PromptRequest):
     max_tokens: int = Field(4096, description="Maximum tokens to generate")
 
 
+class BatchPromptRequest(BaseModel):
+    """Batch prompt request."""
+
+    prompts: list[PromptRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=64,
+        description="The prompts to send to the LLM",
+    )
+
+
+class BatchInstructorRequest(BatchPromptRequest):
+    """Batch instructor request."""
+
+    response_model: Any = Field(..., description="JSON schema response model")
+    max_tokens: int = Field(4096, description="Maximum tokens to generate")
+
+
 class ChainOfVerificationRequest(PromptRequest):
     """Chain of verification request."""
 
@@ -41,18 +57,20 @@ class ChainOfVerificationRequest(PromptRequest):
     error_on_iteration_limit: bool = Field(
         False, description="Whether to raise an error on hitting iteration limit"
     )
+    response_schema: dict[str, Any] | None = Field(
+        None,
+        description="JSON schema response model. If None, the response is text.",
+    )
 
     @pydantic.model_validator(mode="after")
     def validate_create_statements_if_none_provided(self) -> Self:
-        """Raises 400 if no statements are provided or generated."""
+        """Requires create_new_statements if no statements are provided."""
         if not self.statements and not self.create_new_statements:
-            raise fastapi.HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=(
-                    "If no statements are provided then create_new_statements "
-                    "must be set to True."
-                ),
+            msg = (
+                "If no statements are provided then create_new_statements "
+                "must be set to True."
             )
+            raise ValueError(msg)
         return self
 
 
@@ -60,3 +78,18 @@ class LLMResponse(BaseModel):
     """LLM Response base class."""
 
     result: Any = Field(..., description="The LLM response")
+
+
+class BatchResult(BaseModel):
+    """Result of a single prompt in a batch."""
+
+    result: Any = Field(None, description="The LLM response, if the prompt succeeded")
+    error: str | None = Field(None, description="The error, if the prompt failed")
+
+
+class BatchLLMResponse(BaseModel):
+    """Batch LLM response."""
+
+    results: list[BatchResult] = Field(
+        ..., description="The results, in the order of the prompts"
+    )
@@ -1,25 +1,62 @@
 """Endpoints talking to LLMs."""
 
-from typing import Annotated
+import asyncio
+import functools
+from collections.abc import AsyncIterator, Callable, Coroutine
+from typing import Annotated, Any, TypeVar
 
-import cloai
 import fastapi
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+import instructor
+import pydantic
+from fastapi import APIRouter, Body, Depends, Header, status
+from fastapi.responses import StreamingResponse
 
-from cloaiservice.config import get_config
+from cloaiservice.config import ClientEntry, get_config
 from cloaiservice.models.llm import (
+    BatchInstructorRequest,
+    BatchLLMResponse,
+    BatchPromptRequest,
     ChainOfVerificationRequest,
     InstructorRequest,
     LLMResponse,
     PromptRequest,
 )
-from cloaiservice.services import schemaconverter
+from cloaiservice.services import schemaconverter, singleflight, streaming
+from cloaiservice.services.limiter import ConcurrencyLimiter
+
+T = TypeVar("T")
 
 router = APIRouter()
 
+# Serializes LLM results, which may contain Pydantic models, for all routes
+# without constructing an LLMResponse.
+_JSON_ADAPTER: pydantic.TypeAdapter[Any] = pydantic.TypeAdapter(Any)
+
+_DedupeHeader = Annotated[
+    bool,
+    Header(
+        alias="X-CloAI-Dedupe",
+        description=(
+            "Whether identical concurrent requests to the same client may share "
+            "a single LLM call."
+        ),
+    ),
+]
+
+# Identical concurrent requests that opted in share a single upstream call.
+_IN_FLIGHT = singleflight.SingleFlight()
 
-def get_llm_client(id: str) -> cloai.LargeLanguageModel:
-    """Get an LLM client by its ID."""
+# Documents the response model without FastAPI validating it on every call.
+_LLM_RESPONSES: dict[int | str, dict[str, Any]] = {
+    status.HTTP_200_OK: {"model": LLMResponse}
+}
+_BATCH_RESPONSES: dict[int | str, dict[str, Any]] = {
+    status.HTTP_200_OK: {"model": BatchLLMResponse}
+}
+
+
+async def get_client(id: str) -> ClientEntry:
+    """Get an LLM client, with its concurrency limiter, by its ID."""
     client = get_config().clients.get(id)
     if client is None:
         raise fastapi.HTTPException(
@@ -28,57 +65,269 @@ def get_llm_client(id: str) -> cloai.LargeLanguageModel:
     return client
 
 
-@router.post("/run", response_model=LLMResponse)
+@functools.lru_cache(maxsize=512)
+def _prepare_response_model(
+    model: type[pydantic.BaseModel],
+) -> type[pydantic.BaseModel]:
+    """Wrap a response model in instructor's OpenAISchema once.
+
+    Instructor wraps response models that are not an OpenAISchema in a newly
+    created model on every call. The schema converter returns the same class
+    for repeated schemas, so wrapping it once lets instructor skip that build
+    and reuse its cached function schema for the class.
+    """
+    return instructor.openai_schema(model)
+
+
+async def _deduplicate(
+    key: tuple[Any, ...],
+    enabled: bool,
+    function: Callable[[], Coroutine[Any, Any, T]],
+) -> T:
+    """Run the function, sharing its result with identical requests if enabled.
+
+    The function should take the client's limiter itself, so that requests
+    joining a shared call don't wait for, or take up, a slot of their own.
+    """
+    if enabled:
+        return await _IN_FLIGHT.do(key, function)
+    return await function()
+
+
+def _sse_event(data: Any, event: str | None = None) -> bytes:  # noqa: ANN401
+    """Encode a server-sent event with JSON encoded data."""
+    prefix = f"event: {event}\n".encode() if event is not None else b""
+    return prefix + b"data: " + _JSON_ADAPTER.dump_json(data) + b"\n\n"
+
+
+def _result_response(result: Any) -> fastapi.Response:  # noqa: ANN401
+    """Serialize an LLM result, which may be a Pydantic model, as JSON."""
+    return fastapi.Response(
+        content=_JSON_ADAPTER.dump_json({"result": result}),
+        media_type="application/json",
+    )
+
+
+@router.post("/run", responses=_LLM_RESPONSES)
 async def run_prompt(
     request: Annotated[PromptRequest, Body(...)],
-    llm: Annotated[cloai.LargeLanguageModel, Depends(get_llm_client)],
-) -> LLMResponse:
+    client: Annotated[ClientEntry, Depends(get_client)],
+    id: str,
+    dedupe: _DedupeHeader = False,
+) -> fastapi.Response:
     """Run a basic prompt against the LLM."""
-    try:
-        result = await llm.run(
-            system_prompt=request.system_prompt, user_prompt=request.user_prompt
+
+    async def call() -> str:
+        async with client.limiter:
+            return await client.llm.run(
+                system_prompt=request.system_prompt,
+                user_prompt=request.user_prompt,
+            )
+
+    result = await _deduplicate(
+        ("run", id, request.system_prompt, request.user_prompt), dedupe, call
+    )
+    return _result_response(result)
+
+
+async def _run_batch(
+    limiter: ConcurrencyLimiter,
+    calls: list[Callable[[], Coroutine[Any, Any, Any]]],
+) -> fastapi.Response:
+    """Run LLM calls concurrently, reporting the result or error of each call.
+
+    The batch is admitted by the client's limiter as a whole, so it is either
+    rejected with a 429 up front or all calls wait for a slot.
+    """
+
+    async def run(call: Callable[[], Coroutine[Any, Any, Any]]) -> Any:  # noqa: ANN401
+        async with limiter.slot():
+            return await call()
+
+    with limiter.reserve(len(calls)):
+        results = await asyncio.gather(
+            *(run(call) for call in calls), return_exceptions=True
         )
-        return LLMResponse(result=result)
-    except Exception as exc_info:
-        raise HTTPException(status_code=500, detail=str(exc_info)) from exc_info
+    return fastapi.Response(
+        content=_JSON_ADAPTER.dump_json(
+            {
+                "results": [
+                    {"result": None, "error": str(result)}
+                    if isinstance(result, BaseException)
+                    else {"result": result, "error": None}
+                    for result in results
+                ]
+            }
+        ),
+        media_type="application/json",
+    )
+
 
+@router.post("/run/batch", responses=_BATCH_RESPONSES)
+async def run_prompt_batch(
+    request: Annotated[BatchPromptRequest, Body(...)],
+    client: Annotated[ClientEntry, Depends(get_client)],
+) -> fastapi.Response:
+    """Run multiple basic prompts against the LLM concurrently."""
+    return await _run_batch(
+        client.limiter,
+        [
+            functools.partial(
+                client.llm.run,
+                system_prompt=prompt.system_prompt,
+                user_prompt=prompt.user_prompt,
+            )
+            for prompt in request.prompts
+        ],
+    )
 
-@router.post("/instructor", response_model=LLMResponse)
+
+@router.post("/run/stream", response_class=StreamingResponse)
+async def stream_prompt(
+    request: Annotated[PromptRequest, Body(...)],
+    client: Annotated[ClientEntry, Depends(get_client)],
+) -> StreamingResponse:
+    """Run a basic prompt against the LLM, streaming the output as server-sent events.
+
+    Each event contains a JSON encoded chunk of text. Errors after the stream
+    has started are sent as an "error" event, as the status code has already
+    been sent.
+    """
+    client.limiter.check()
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async with client.limiter:
+                async for chunk in streaming.stream_run(
+                    client.llm,
+                    system_prompt=request.system_prompt,
+                    user_prompt=request.user_prompt,
+                ):
+                    yield _sse_event(chunk)
+        except Exception as exc_info:
+            yield _sse_event({"detail": str(exc_info)}, event="error")
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post("/instructor", responses=_LLM_RESPONSES)
 async def run_instructor(
     request: Annotated[InstructorRequest, Body(...)],
-    llm: Annotated[cloai.LargeLanguageModel, Depends(get_llm_client)],
-) -> LLMResponse:
+    client: Annotated[ClientEntry, Depends(get_client)],
+    id: str,
+    dedupe: _DedupeHeader = False,
+) -> fastapi.Response:
     """Run a structured query using instructor."""
-    try:
-        model = schemaconverter.create_model_from_schema(request.response_model)
+    model = _prepare_response_model(
+        await schemaconverter.create_model_from_schema_async(request.response_model)
+    )
 
-        result = await llm.call_instructor(
-            response_model=model,
-            system_prompt=request.system_prompt,
-            user_prompt=request.user_prompt,
-            max_tokens=request.max_tokens,
-        )
-        return LLMResponse(result=result)
-    except Exception as exc_info:
-        raise HTTPException(status_code=500, detail=str(exc_info)) from exc_info
+    async def call() -> Any:  # noqa: ANN401
+        async with client.limiter:
+            return await client.llm.call_instructor(
+                response_model=model,
+                system_prompt=request.system_prompt,
+                user_prompt=request.user_prompt,
+                max_tokens=request.max_tokens,
+            )
+
+    # Equal schemas map to the same cached model, so the model identifies the
+    # schema in the deduplication key.
+    result = await _deduplicate(
+        (
+            "instructor",
+            id,
+            model,
+            request.system_prompt,
+            request.user_prompt,
+            request.max_tokens,
+        ),
+        dedupe,
+        call,
+    )
+    return _result_response(result)
 
 
-@router.post("/cov", response_model=LLMResponse)
+@router.post("/instructor/batch", responses=_BATCH_RESPONSES)
+async def run_instructor_batch(
+    request: Annotated[BatchInstructorRequest, Body(...)],
+    client: Annotated[ClientEntry, Depends(get_client)],
+) -> fastapi.Response:
+    """Run multiple structured queries with a shared response model concurrently."""
+    model = _prepare_response_model(
+        await schemaconverter.create_model_from_schema_async(request.response_model)
+    )
+
+    return await _run_batch(
+        client.limiter,
+        [
+            functools.partial(
+                client.llm.call_instructor,
+                response_model=model,
+                system_prompt=prompt.system_prompt,
+                user_prompt=prompt.user_prompt,
+                max_tokens=request.max_tokens,
+            )
+            for prompt in request.prompts
+        ],
+    )
+
+
+@router.post("/instructor/stream", response_class=StreamingResponse)
+async def stream_instructor(
+    request: Annotated[InstructorRequest, Body(...)],
+    client: Annotated[ClientEntry, Depends(get_client)],
+) -> StreamingResponse:
+    """Run a structured query, streaming partial results as server-sent events.
+
+    Each event contains the JSON encoded result generated so far; fields that
+    have not been generated yet are null. The last event contains the complete
+    result.
+    """
+    client.limiter.check()
+    model = _prepare_response_model(
+        await schemaconverter.create_model_from_schema_async(request.response_model)
+    )
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async with client.limiter:
+                async for partial in streaming.stream_instructor(
+                    client.llm,
+                    response_model=model,
+                    system_prompt=request.system_prompt,
+                    user_prompt=request.user_prompt,
+                    max_tokens=request.max_tokens,
+                ):
+                    yield _sse_event(partial)
+        except Exception as exc_info:
+            yield _sse_event({"detail": str(exc_info)}, event="error")
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post("/cov", responses=_LLM_RESPONSES)
 async def chain_of_verification(
     request: Annotated[ChainOfVerificationRequest, Body(...)],
-    llm: Annotated[cloai.LargeLanguageModel, Depends(get_llm_client)],
-) -> LLMResponse:
+    client: Annotated[ClientEntry, Depends(get_client)],
+) -> fastapi.Response:
     """Run chain of verification on a prompt."""
-    try:
-        result = await llm.chain_of_verification(  # type: ignore[call-arg] # pycharm is confused
+    response_model: type = str
+    if request.response_schema is not None:
+        response_model = _prepare_response_model(
+            await schemaconverter.create_model_from_schema_async(
+                request.response_schema
+            )
+        )
+
+    async with client.limiter:
+        result = await client.llm.chain_of_verification(  # type: ignore[call-arg] # pycharm is confused
             system_prompt=request.system_prompt,
             user_prompt=request.user_prompt,
-            response_model=str,
+            response_model=response_model,
             statements=request.statements,
             max_verifications=request.max_verifications,
             create_new_statements=request.create_new_statements,
             error_on_iteration_limit=request.error_on_iteration_limit,
         )
-        return LLMResponse(result=result)
-    except Exception as exc_info:
-        raise HTTPException(status_code=500, detail=str(exc_info)) from exc_info
+        return _result_response(result)
@@ -0,0 +1,98 @@
+"""Per-client concurrency limits.
+
+Bounds the number of requests that are running against, or waiting for, an
+LLM client so that bursts are rejected instead of piling up while a provider
+is throttling.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Iterator
+from types import TracebackType
+
+import fastapi
+from fastapi import status
+
+
+class ConcurrencyLimiter:
+    """Limits the in-flight and pending requests to an LLM client.
+
+    Up to max_concurrency requests run at once and up to max_pending further
+    requests wait for a slot. Requests beyond that are rejected with a 429.
+    """
+
+    def __init__(self, max_concurrency: int, max_pending: int) -> None:
+        """Initializes the limiter.
+
+        Args:
+            max_concurrency: The maximum number of concurrently running requests.
+            max_pending: The maximum number of requests waiting for a slot.
+        """
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._capacity = max_concurrency + max_pending
+        self._active = 0
+
+    def check(self, count: int = 1) -> None:
+        """Checks that requests can be admitted.
+
+        Args:
+            count: The number of requests to admit.
+
+        Raises:
+            429: If the client has no capacity left for all requests.
+        """
+        if self._active + count > self._capacity:
+            raise fastapi.HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests for this client.",
+            )
+
+    @contextlib.contextmanager
+    def reserve(self, count: int) -> Iterator[None]:
+        """Admits a group of requests at once, or rejects all of them.
+
+        The requests count against the capacity until the group is done. Each
+        request runs once it gets a slot from slot().
+
+        Args:
+            count: The number of requests to admit.
+
+        Raises:
+            429: If the client has no capacity left for all requests.
+        """
+        self.check(count)
+        self._active += count
+        try:
+            yield
+        finally:
+            self._active -= count
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Waits for a slot for a request admitted with reserve()."""
+        async with self._semaphore:
+            yield
+
+    async def __aenter__(self) -> None:
+        """Waits for a slot.
+
+        Raises:
+            429: If the client has no capacity left.
+        """
+        self.check()
+        self._active += 1
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            self._active -= 1
+            raise
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Releases the slot."""
+        self._semaphore.release()
+        self._active -= 1
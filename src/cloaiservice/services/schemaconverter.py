@@ -4,9 +4,14 @@ Used to send pydantic models over the wire.
 Simple placeholder until LLM apis support JSON schema directly.
 """
 
-from typing import Any, Dict, List, Optional, Union
+import asyncio
+import collections
+import functools
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field, create_model
+from pydantic import BaseModel, ConfigDict, Field, create_model
 
 _TYPE_MAPPING = {
     "string": str,
@@ -18,66 +23,147 @@ _TYPE_MAPPING = {
     "null": None,
 }
 
+_MISSING = object()
+
+# Converted models are used through instructor's subclass of them, so building
+# their own validators up front would mostly be wasted.
+_MODEL_CONFIG = ConfigDict(defer_build=True)
+
+_MODEL_CACHE_SIZE = 512
+# Least recently used models by canonical schema. Guarded by the lock, as models
+# are built in worker threads.
+_MODEL_CACHE: collections.OrderedDict[str, type[BaseModel]] = collections.OrderedDict()
+_MODEL_CACHE_LOCK = threading.Lock()
+
 
 def _convert_property_type(prop_schema: Dict[str, Any]) -> tuple[Any, Any]:
     """Convert JSON Schema property type to Python/Pydantic type."""
-    if "type" not in prop_schema:
+    prop_type = prop_schema.get("type", _MISSING)
+    if prop_type is _MISSING:
         return Any, ...
 
-    prop_type = prop_schema["type"]
-    is_required = prop_schema.get("required", True)
-    default_value = prop_schema.get("default", ... if is_required else None)
-
-    if prop_type == "array":
-        items = prop_schema.get("items", {})
-        if "type" in items:
-            item_type, _ = _convert_property_type(items)
-            return List[item_type], default_value  # type: ignore[valid-type]
-        return List[Any], default_value
-
-    if prop_type == "object":
-        nested_properties = prop_schema.get("properties", {})
-        model_name = prop_schema.get("title", "NestedModel")
-
-        nested_model = create_model_from_schema(
-            {
-                "type": "object",
-                "properties": nested_properties,
-                "required": prop_schema.get("required", []),
-                "title": model_name,
-            }
-        )
-        return nested_model, default_value
+    default_value = prop_schema.get("default", ...)
+    if default_value is ... and not prop_schema.get("required", True):
+        default_value = None
 
     if isinstance(prop_type, list):
         # Handle multiple types (union type)
-        types = [_TYPE_MAPPING.get(t, Any) for t in prop_type if t != "null"]
-        if len(types) == 1:
-            return (
-                (Optional[types[0]], default_value)
-                if "null" in prop_type
-                else (types[0], default_value)
-            )
-        union_type = Union[tuple(types)]  # type: ignore
-        return (
-            (Optional[union_type], default_value)
-            if "null" in prop_type
-            else (union_type, default_value)
-        )
+        return _union_type(tuple(prop_type)), default_value
+
+    handler = _PROPERTY_HANDLERS.get(prop_type)
+    if handler is not None:
+        return handler(prop_schema), default_value
+    return _TYPE_MAPPING.get(prop_type, Any), default_value
+
+
+def _array_type(prop_schema: Dict[str, Any]) -> Any:  # noqa: ANN401
+    """Convert a JSON Schema array property to a list type."""
+    items = prop_schema.get("items", {})
+    if "type" in items:
+        item_type, _ = _convert_property_type(items)
+        return List[item_type]  # type: ignore[valid-type]
+    return List[Any]
+
+
+def _object_type(prop_schema: Dict[str, Any]) -> type[BaseModel]:
+    """Convert a JSON Schema object property to a nested model."""
+    # Nested models are built as part of their root schema, which is what the
+    # cache is keyed on.
+    return _build_model(
+        prop_schema.get("properties", {}),
+        prop_schema.get("required", []),
+        prop_schema.get("title", "NestedModel"),
+    )
+
+
+# Types that need more than a lookup in the type mapping.
+_PROPERTY_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "array": _array_type,
+    "object": _object_type,
+}
 
-    python_type = _TYPE_MAPPING.get(prop_type, Any)
-    return python_type, default_value
+
+@functools.lru_cache(maxsize=128)
+def _union_type(type_names: tuple[str, ...]) -> Any:  # noqa: ANN401
+    """Get the (optional) union of JSON Schema types, reusing earlier unions."""
+    types = [_TYPE_MAPPING.get(t, Any) for t in type_names if t != "null"]
+    union_type = types[0] if len(types) == 1 else Union[tuple(types)]  # type: ignore
+    return Optional[union_type] if "null" in type_names else union_type
 
 
 def create_model_from_schema(schema: Dict[str, Any]) -> type[BaseModel]:
-    """Create a Pydantic model from a JSON Schema."""
+    """Create a Pydantic model from a JSON Schema.
+
+    Models are cached by the canonical JSON form of the schema, so repeated
+    schemas return the same model class without rebuilding it.
+    """
+    key = _schema_key(schema)
+    model = _get_cached_model(key)
+    if model is None:
+        model = _build_and_cache_model(key, schema)
+    return model
+
+
+async def create_model_from_schema_async(schema: Dict[str, Any]) -> type[BaseModel]:
+    """Create a Pydantic model from a JSON Schema without blocking the event loop.
+
+    Cached models are returned directly; uncached schemas are built in a worker
+    thread, as building a model is CPU-bound.
+    """
+    key = _schema_key(schema)
+    model = _get_cached_model(key)
+    if model is None:
+        model = await asyncio.to_thread(_build_and_cache_model, key, schema)
+    return model
+
+
+def _schema_key(schema: Dict[str, Any]) -> str:
+    """Get the canonical JSON form of a schema, used as its cache key.
+
+    Unlike orjson, which writes NaN and infinities as null, the standard library
+    keeps every value that request bodies may contain distinct.
+    """
+    return json.dumps(schema, sort_keys=True, separators=(",", ":"))
+
+
+def _get_cached_model(key: str) -> type[BaseModel] | None:
+    """Get a cached model, marking it as recently used."""
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is not None:
+            _MODEL_CACHE.move_to_end(key)
+        return model
+
+
+def _build_and_cache_model(key: str, schema: Dict[str, Any]) -> type[BaseModel]:
+    """Build a model and cache it, evicting the least recently used model."""
+    model = _build_model_from_schema(schema)
+    with _MODEL_CACHE_LOCK:
+        # Another thread may have built the same schema in the meantime; keep
+        # the first model so that a schema always maps to the same class.
+        model = _MODEL_CACHE.setdefault(key, model)
+        _MODEL_CACHE.move_to_end(key)
+        if len(_MODEL_CACHE) > _MODEL_CACHE_SIZE:
+            _MODEL_CACHE.popitem(last=False)
+    return model
+
+
+def _build_model_from_schema(schema: Dict[str, Any]) -> type[BaseModel]:
+    """Create a Pydantic model from a JSON Schema without caching."""
     if schema.get("type") != "object":
         raise ValueError("Root schema must be of type 'object'")
 
-    properties = schema.get("properties", {})
-    required = schema.get("required", [])
-    model_name: str = schema.get("title", "GeneratedModel")
+    return _build_model(
+        schema.get("properties", {}),
+        schema.get("required", []),
+        schema.get("title", "GeneratedModel"),
+    )
+
 
+def _build_model(
+    properties: Dict[str, Any], required: List[str], model_name: str
+) -> type[BaseModel]:
+    """Create a Pydantic model from the properties of an object schema."""
     field_definitions = {}
 
     for prop_name, prop_schema in properties.items():
@@ -89,11 +175,18 @@ def create_model_from_schema(schema: Dict[str, Any]) -> type[BaseModel]:
         }
 
         # Handle default value
-        if default_value is not ...:
-            field_kwargs["default"] = default_value
-        elif prop_name not in required:
-            field_kwargs["default"] = None
-
-        field_definitions[prop_name] = (python_type, Field(**field_kwargs))
+        if default_value is ... and prop_name not in required:
+            default_value = None
+
+        # Fields without constraints need no FieldInfo; a plain default will do.
+        if field_kwargs:
+            field_definitions[prop_name] = (
+                python_type,
+                Field(default_value, **field_kwargs),
+            )
+        else:
+            field_definitions[prop_name] = (python_type, default_value)
 
-    return create_model(model_name, **field_definitions)  # type: ignore[call-overload]
+    return create_model(  # type: ignore[call-overload]
+        model_name, __config__=_MODEL_CONFIG, **field_definitions
+    )
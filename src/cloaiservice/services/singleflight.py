@@ -0,0 +1,47 @@
+"""Deduplicate identical concurrent calls.
+
+While a call for a key is in flight, further calls with the same key await
+its result instead of starting their own. Once the call finishes the key is
+released, so results are never cached beyond the in-flight window.
+"""
+
+import asyncio
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Shares the result of a call with concurrent callers using the same key."""
+
+    def __init__(self) -> None:
+        """Initializes the in-flight calls."""
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+
+    async def do(
+        self, key: Hashable, function: Callable[[], Coroutine[Any, Any, T]]
+    ) -> T:
+        """Runs the function, or joins the in-flight call with the same key.
+
+        The call runs in its own task, so a caller being cancelled does not
+        cancel the call for the other callers.
+
+        Args:
+            key: Identifies calls that may share a result.
+            function: Creates the coroutine to run if no call is in flight.
+
+        Returns:
+            The result of the call.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(function())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Removes a finished call, unless it was already replaced."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
@@ -0,0 +1,123 @@
+"""Stream LLM output as it is generated.
+
+cloai only returns complete responses, so streaming talks to the provider SDK
+clients held by the cloai clients. Clients without a known streaming API fall
+back to a single chunk containing the complete response.
+"""
+
+import functools
+from collections.abc import AsyncIterator
+from typing import Any
+
+import cloai
+import instructor
+from pydantic import BaseModel
+
+
+async def stream_run(
+    llm: cloai.LargeLanguageModel, system_prompt: str, user_prompt: str
+) -> AsyncIterator[str]:
+    """Runs the model with the given prompts, yielding the output text in chunks.
+
+    Args:
+        llm: The LLM client.
+        system_prompt: The system prompt.
+        user_prompt: The user prompt.
+
+    Yields:
+        The output text as it is generated.
+    """
+    base_client = llm.client
+    if isinstance(base_client, (cloai.OpenAiLlm, cloai.AzureLlm)):
+        completion = await base_client.client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            model=base_client.model,
+            stream=True,
+        )
+        async for chunk in completion:
+            # Azure may send chunks without choices, e.g. for content filtering.
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    elif isinstance(base_client, cloai.AnthropicBedrockLlm):
+        events = await base_client.client.messages.create(
+            model=base_client.model,
+            max_tokens=4096,
+            system=system_prompt,
+            messages=[{"role": "user", "content": user_prompt}],
+            stream=True,
+        )
+        async for event in events:
+            if event.type == "content_block_delta" and event.delta.type == "text_delta":
+                yield event.delta.text
+    else:
+        yield await llm.run(system_prompt=system_prompt, user_prompt=user_prompt)
+
+
+async def stream_instructor(
+    llm: cloai.LargeLanguageModel,
+    response_model: type[BaseModel],
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int = 4096,
+) -> AsyncIterator[BaseModel]:
+    """Runs a structured query, yielding partial models as they are generated.
+
+    Args:
+        llm: The LLM client.
+        response_model: The Pydantic response model.
+        system_prompt: The system prompt.
+        user_prompt: The user prompt.
+        max_tokens: The maximum number of tokens to allow.
+
+    Yields:
+        Partial models with the fields generated so far, ending with the
+        complete model.
+    """
+    base_client = llm.client
+    messages: dict[str, Any]
+    if isinstance(base_client, (cloai.OpenAiLlm, cloai.AzureLlm)):
+        messages = {
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ]
+        }
+    elif isinstance(base_client, cloai.AnthropicBedrockLlm):
+        messages = {
+            "messages": [{"role": "user", "content": user_prompt}],
+            "system": system_prompt,
+        }
+    else:
+        yield await llm.call_instructor(
+            response_model=response_model,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            max_tokens=max_tokens,
+        )
+        return
+
+    partials = _instructor_client(base_client).create_partial(
+        response_model=response_model,
+        model=base_client.model,
+        max_tokens=max_tokens,
+        **messages,
+    )
+    async for partial in partials:
+        yield partial
+
+
+@functools.lru_cache(maxsize=64)
+def _instructor_client(
+    base_client: cloai.OpenAiLlm | cloai.AzureLlm | cloai.AnthropicBedrockLlm,
+) -> instructor.AsyncInstructor:
+    """Get an instructor client for the SDK client of a cloai client.
+
+    The instructor client is built once per client and uses instructor's default
+    mode for the provider, which is also cloai's default.
+    """
+    if isinstance(base_client, cloai.AnthropicBedrockLlm):
+        return instructor.from_anthropic(base_client.client)
+    return instructor.from_openai(base_client.client)
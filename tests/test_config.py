@@ -1,5 +1,6 @@
 """Unit tests for the config module."""
 
+import asyncio
 import functools
 import os
 import pathlib
@@ -11,12 +12,7 @@ import pytest
 from fastapi import status
 
 from cloaiservice import config
-
-
-@pytest.fixture(autouse=True, scope="function")
-def reset_cache() -> None:
-    """Resets the get_config cache on every test."""
-    config.get_config.cache_clear()
+from cloaiservice.models.clients import AvailableClientsResponse
 
 
 @pytest.fixture
@@ -56,45 +52,45 @@ def reset_env_variables(*env_vars: str) -> Callable:
 
 
 @reset_env_variables("CONFIG_PATH", "CONFIG_JSON")
-def test_get_config_environment(config_json: str) -> None:
+def test_load_config_environment(config_json: str) -> None:
     """Get CONFIG_JSON from environment."""
     os.environ["CONFIG_PATH"] = ""
     os.environ["CONFIG_JSON"] = config_json
 
-    result = config.get_config()
+    result = asyncio.run(config.load_config())
 
     assert len(result.clients) == 1
     assert (
-        result.clients["test-model"].client.model
+        result.clients["test-model"].llm.client.model
         == "anthropic.claude-3-5-sonnet-20241022-v2:0"
     )
 
 
 @reset_env_variables("CONFIG_PATH", "CONFIG_JSON")
-def test_get_config_file(tmp_path: pathlib.Path, config_json: str) -> None:
+def test_load_config_file(tmp_path: pathlib.Path, config_json: str) -> None:
     """Get CONFIG_JSON from file."""
     config_file = tmp_path / "config.json"
     config_file.write_text(config_json)
     os.environ["CONFIG_PATH"] = str(config_file)
     os.environ["CONFIG_JSON"] = ""
 
-    result = config.get_config()
+    result = asyncio.run(config.load_config())
 
     assert len(result.clients) == 1
     assert (
-        result.clients["test-model"].client.model
+        result.clients["test-model"].llm.client.model
         == "anthropic.claude-3-5-sonnet-20241022-v2:0"
     )
 
 
 @reset_env_variables("CONFIG_PATH", "CONFIG_JSON")
-def test_get_config_not_specified() -> None:
+def test_load_config_not_specified() -> None:
     """Test that an error is raised for no config specified."""
     os.environ["CONFIG_PATH"] = ""
     os.environ["CONFIG_JSON"] = ""
 
     with pytest.raises(fastapi.HTTPException) as exc_info:
-        config.get_config()
+        asyncio.run(config.load_config())
 
     assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
 
@@ -108,11 +104,13 @@ def test_create_clients_happy_path() -> None:
         }
     }
 
-    result = config.create_clients(config_json)
+    result = asyncio.run(config.create_clients(config_json))
 
     assert result.keys() == {"gpt4o", "gpt3"}
-    assert isinstance(result["gpt4o"], cloai.LargeLanguageModel)
-    assert isinstance(result["gpt3"], cloai.LargeLanguageModel)
+    assert isinstance(result["gpt4o"].llm, cloai.LargeLanguageModel)
+    assert isinstance(result["gpt3"].llm, cloai.LargeLanguageModel)
+    assert result["gpt4o"].info.model == "gpt-4o"
+    assert result["gpt4o"].info.type == "OpenAI"
 
 
 def test_create_clients_no_type() -> None:
@@ -124,7 +122,7 @@ def test_create_clients_no_type() -> None:
     }
 
     with pytest.raises(fastapi.HTTPException) as exc_info:
-        config.create_clients(config_json)
+        asyncio.run(config.create_clients(config_json))
 
     assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert "missing a 'type'" in exc_info.value.detail
@@ -139,7 +137,7 @@ def test_create_clients_unknown_type() -> None:
     }
 
     with pytest.raises(fastapi.HTTPException) as exc_info:
-        config.create_clients(config_json)
+        asyncio.run(config.create_clients(config_json))
 
     assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert "Unknown client" in exc_info.value.detail
@@ -160,7 +158,7 @@ def test_create_clients_pydantic_validation_error() -> None:
     }
 
     with pytest.raises(fastapi.HTTPException) as exc_info:
-        config.create_clients(config_json)
+        asyncio.run(config.create_clients(config_json))
 
     assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert "aws_access_key" in exc_info.value.detail
@@ -184,10 +182,74 @@ def test_create_clients_multiple_errors() -> None:
     }
 
     with pytest.raises(fastapi.HTTPException) as exc_info:
-        config.create_clients(config_json)
+        asyncio.run(config.create_clients(config_json))
 
     assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert "Client gpt4o is missing a 'type'" in exc_info.value.detail
     assert "aws_access_key" in exc_info.value.detail
     assert "aws_secret_key" in exc_info.value.detail
     assert "SECRETKEY" not in exc_info.value.detail
+
+
+@reset_env_variables("CONFIG_PATH", "CONFIG_JSON")
+def test_load_config_client_info_json(config_json: str) -> None:
+    """Tests that the serialized client descriptions match the model."""
+    os.environ["CONFIG_PATH"] = ""
+    os.environ["CONFIG_JSON"] = config_json
+
+    result = asyncio.run(config.load_config())
+
+    client_info = AvailableClientsResponse.model_validate_json(result.client_info_json)
+
+    assert client_info.clients["test-model"].type == "Bedrock"
+
+
+def test_close_clients() -> None:
+    """Tests that the SDK clients are closed."""
+    clients = asyncio.run(
+        config.create_clients(
+            {
+                "clients": {
+                    "gpt4o": {"type": "openai", "model": "gpt-4o", "api_key": "abc"}
+                }
+            }
+        )
+    )
+
+    asyncio.run(config.close_clients(clients))
+
+    assert clients["gpt4o"].llm.client.client.is_closed()  # type: ignore[attr-defined]
+
+
+def test_create_clients_invalid_max_concurrency() -> None:
+    """Tests that a non-positive max_concurrency is rejected."""
+    config_json = {
+        "clients": {
+            "gpt4o": {
+                "type": "openai",
+                "model": "gpt-4o",
+                "api_key": "abc",
+                "max_concurrency": 0,
+            },
+        }
+    }
+
+    with pytest.raises(fastapi.HTTPException) as exc_info:
+        asyncio.run(config.create_clients(config_json))
+
+    assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert "max_concurrency" in exc_info.value.detail
+
+
+@reset_env_variables("CONFIG_PATH", "CONFIG_JSON")
+def test_get_config_after_init(
+    config_json: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that get_config returns the config loaded on startup."""
+    monkeypatch.setattr(config, "_CONFIG", None)
+    os.environ["CONFIG_PATH"] = ""
+    os.environ["CONFIG_JSON"] = config_json
+
+    loaded = asyncio.run(config.init_config())
+
+    assert config.get_config() is loaded
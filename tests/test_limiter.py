@@ -0,0 +1,71 @@
+"""Unit tests for the concurrency limiter."""
+
+import asyncio
+
+import fastapi
+import pytest
+from fastapi import status
+
+from cloaiservice.services import limiter
+
+
+def test_limiter_rejects_when_saturated() -> None:
+    """Tests that requests beyond the running and pending limits get a 429."""
+
+    async def run() -> None:
+        concurrency_limiter = limiter.ConcurrencyLimiter(
+            max_concurrency=1, max_pending=1
+        )
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with concurrency_limiter:
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold()) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(fastapi.HTTPException) as exc_info:
+            async with concurrency_limiter:
+                pass
+        assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        release.set()
+        await asyncio.gather(*tasks)
+        concurrency_limiter.check(2)
+
+    asyncio.run(run())
+
+
+def test_limiter_releases_on_error() -> None:
+    """Tests that a slot is released when the request fails."""
+
+    async def run() -> None:
+        concurrency_limiter = limiter.ConcurrencyLimiter(
+            max_concurrency=1, max_pending=0
+        )
+
+        with pytest.raises(ValueError):
+            async with concurrency_limiter:
+                raise ValueError
+
+        async with concurrency_limiter:
+            with pytest.raises(fastapi.HTTPException):
+                concurrency_limiter.check()
+
+    asyncio.run(run())
+
+
+def test_limiter_reserve() -> None:
+    """Tests that a group of requests is admitted or rejected as a whole."""
+    concurrency_limiter = limiter.ConcurrencyLimiter(max_concurrency=1, max_pending=1)
+
+    with pytest.raises(fastapi.HTTPException) as exc_info:
+        with concurrency_limiter.reserve(3):
+            pass
+    assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    with concurrency_limiter.reserve(2):
+        with pytest.raises(fastapi.HTTPException):
+            concurrency_limiter.check()
+    concurrency_limiter.check(2)
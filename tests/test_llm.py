@@ -0,0 +1,267 @@
+"""Unit tests for the LLM endpoints."""
+
+import asyncio
+import json
+import typing
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+import cloai
+import fastapi
+import httpx
+import pytest
+from cloai.llm import utils
+from fastapi import status
+
+from cloaiservice import config
+from cloaiservice.main import app
+from cloaiservice.models.clients import ClientInfo
+from cloaiservice.routes import llm as llm_routes
+from cloaiservice.services.limiter import ConcurrencyLimiter
+
+T = TypeVar("T")
+
+
+class _CountingLlm(utils.LlmBaseClass):
+    """An LLM client that counts its calls.
+
+    Structured queries return a list with no verification statements, the
+    user prompt for str, and a model with the name "test" otherwise.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.response_models: list[Any] = []
+        self.error: Exception | None = None
+
+    async def run(self, system_prompt: str, user_prompt: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.1)
+        if self.error is not None:
+            raise self.error
+        return f"{system_prompt} {user_prompt}"
+
+    async def call_instructor(
+        self,
+        response_model: type[T],
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+    ) -> T:
+        self.response_models.append(response_model)
+        if typing.get_origin(response_model) is list:
+            return []  # type: ignore[return-value]
+        if response_model is str:
+            return user_prompt  # type: ignore[return-value]
+        return response_model.model_validate({"name": "test"})  # type: ignore[attr-defined, no-any-return]
+
+
+@pytest.fixture
+def llm(monkeypatch: pytest.MonkeyPatch) -> _CountingLlm:
+    """Serves a single counting client, limited to one concurrent request."""
+    base_client = _CountingLlm()
+    entry = config.ClientEntry(
+        llm=cloai.LargeLanguageModel(client=base_client),
+        info=ClientInfo(provider="Test", model="test", type="Test"),
+        limiter=ConcurrencyLimiter(max_concurrency=1, max_pending=2),
+    )
+    monkeypatch.setattr(
+        config,
+        "_CONFIG",
+        config.Config(clients={"test": entry}, client_info_json=b"{}"),
+    )
+    return base_client
+
+
+def test_run_deduplicated_requests_share_a_slot(llm: _CountingLlm) -> None:
+    """Tests that deduplicated requests share one call and one limiter slot."""
+    n_requests = 6
+
+    async def post_all() -> list[httpx.Response]:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),  # type: ignore[arg-type]
+            base_url="http://test",
+        ) as client:
+            return await asyncio.gather(
+                *(
+                    client.post(
+                        "/v1/llm/run",
+                        params={"id": "test"},
+                        headers={"X-CloAI-Dedupe": "1"},
+                        json={"system_prompt": "system", "user_prompt": "user"},
+                    )
+                    for _ in range(n_requests)
+                )
+            )
+
+    responses = asyncio.run(post_all())
+
+    assert [response.status_code for response in responses] == (
+        [status.HTTP_200_OK] * n_requests
+    )
+    assert all(response.json() == {"result": "system user"} for response in responses)
+    assert llm.calls == 1
+
+
+def _post(
+    path: str, body: dict[str, Any], *, raise_app_exceptions: bool = True
+) -> httpx.Response:
+    """Post a request for the test client to the app."""
+
+    async def post() -> httpx.Response:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(
+                app=app,  # type: ignore[arg-type]
+                raise_app_exceptions=raise_app_exceptions,
+            ),
+            base_url="http://test",
+        ) as client:
+            return await client.post(path, params={"id": "test"}, json=body)
+
+    return asyncio.run(post())
+
+
+def test_run_upstream_error(llm: _CountingLlm) -> None:
+    """Tests that errors of the LLM client are reported as internal errors."""
+    llm.error = RuntimeError("upstream failed")
+
+    response = _post(
+        "/v1/llm/run",
+        {"system_prompt": "system", "user_prompt": "user"},
+        raise_app_exceptions=False,
+    )
+
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert response.json() == {"detail": "upstream failed"}
+
+
+def test_chain_of_verification_default_response(llm: _CountingLlm) -> None:
+    """Tests that chain of verification returns text without a response schema."""
+    response = _post(
+        "/v1/llm/cov",
+        {"system_prompt": "system", "user_prompt": "user", "statements": ["a"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"result": "user"}
+
+
+def test_chain_of_verification_response_schema(llm: _CountingLlm) -> None:
+    """Tests that chain of verification returns a structured result for a schema."""
+    response = _post(
+        "/v1/llm/cov",
+        {
+            "system_prompt": "system",
+            "user_prompt": "user",
+            "statements": ["a"],
+            "response_schema": {
+                "type": "object",
+                "title": "Answer",
+                "properties": {"name": {"type": "string"}},
+                "required": ["name"],
+            },
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"result": {"name": "test"}}
+
+
+def test_run_batch_results_in_order() -> None:
+    """Tests that batch results keep their order and report errors per call."""
+
+    async def slow() -> str:
+        await asyncio.sleep(0.02)
+        return "slow"
+
+    async def fail() -> str:
+        raise ValueError("failed")
+
+    async def fast() -> str:
+        return "fast"
+
+    calls: list[Callable[[], Coroutine[Any, Any, str]]] = [slow, fail, fast]
+    limiter = ConcurrencyLimiter(max_concurrency=2, max_pending=1)
+
+    response = asyncio.run(llm_routes._run_batch(limiter, calls))
+
+    assert json.loads(bytes(response.body)) == {
+        "results": [
+            {"result": "slow", "error": None},
+            {"result": None, "error": "failed"},
+            {"result": "fast", "error": None},
+        ]
+    }
+    limiter.check(3)
+
+
+def test_run_batch_beyond_capacity() -> None:
+    """Tests that a batch beyond the client's capacity is rejected as a whole."""
+    limiter = ConcurrencyLimiter(max_concurrency=2, max_pending=3)
+
+    async def run() -> str:
+        return "ok"
+
+    calls: list[Callable[[], Coroutine[Any, Any, str]]] = [run] * 6
+
+    with pytest.raises(fastapi.HTTPException) as exc_info:
+        asyncio.run(llm_routes._run_batch(limiter, calls))
+
+    assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_run_batch_route(llm: _CountingLlm) -> None:
+    """Tests that /run/batch returns the results in the order of the prompts."""
+    response = _post(
+        "/v1/llm/run/batch",
+        {
+            "prompts": [
+                {"system_prompt": "system", "user_prompt": "first"},
+                {"system_prompt": "system", "user_prompt": "second"},
+            ]
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "results": [
+            {"result": "system first", "error": None},
+            {"result": "system second", "error": None},
+        ]
+    }
+
+
+@pytest.mark.parametrize("n_prompts", [0, 65])
+def test_run_batch_route_size(llm: _CountingLlm, n_prompts: int) -> None:
+    """Tests that empty and oversized batches are rejected."""
+    prompt = {"system_prompt": "system", "user_prompt": "user"}
+
+    response = _post("/v1/llm/run/batch", {"prompts": [prompt] * n_prompts})
+
+    assert response.status_code == 422
+    assert llm.calls == 0
+
+
+def test_instructor_batch_route(llm: _CountingLlm) -> None:
+    """Tests that /instructor/batch builds one model for all prompts."""
+    prompt = {"system_prompt": "system", "user_prompt": "user"}
+
+    response = _post(
+        "/v1/llm/instructor/batch",
+        {
+            "prompts": [prompt, prompt],
+            "response_model": {
+                "type": "object",
+                "title": "Answer",
+                "properties": {"name": {"type": "string"}},
+                "required": ["name"],
+            },
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "results": [{"result": {"name": "test"}, "error": None}] * 2
+    }
+    assert len(llm.response_models) == 2
+    assert llm.response_models[0] is llm.response_models[1]
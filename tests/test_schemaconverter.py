@@ -1,5 +1,9 @@
 """Unit tests for the schema converter."""
 
+import asyncio
+import math
+from typing import Optional, Union
+
 import pydantic
 
 from cloaiservice.services import schemaconverter
@@ -14,3 +18,124 @@ def test_create_model_from_schema_tuple_str() -> None:
     new_model = schemaconverter.create_model_from_schema(Model.model_json_schema())
 
     assert Model.model_json_schema() == new_model.model_json_schema()
+
+
+def test_create_model_from_schema_cached() -> None:
+    """Tests that equal schemas return the same model regardless of key order."""
+    schema = {
+        "type": "object",
+        "title": "Model",
+        "properties": {"name": {"type": "string"}, "age": {"type": "integer"}},
+        "required": ["name", "age"],
+    }
+    reordered = dict(reversed(schema.items()))
+
+    first = schemaconverter.create_model_from_schema(schema)
+    second = schemaconverter.create_model_from_schema(reordered)
+
+    assert first is second
+
+
+def test_create_model_from_schema_nested_cache_entries() -> None:
+    """Tests that nested models are not cached as root models of their own."""
+    address_schema = {
+        "type": "object",
+        "title": "Address",
+        "properties": {"city": {"type": "string"}},
+        "required": ["city"],
+    }
+    schema = {
+        "type": "object",
+        "title": "Person",
+        "properties": {"address": address_schema},
+        "required": ["address"],
+    }
+
+    model = schemaconverter.create_model_from_schema(schema)
+    address_model = schemaconverter.create_model_from_schema(address_schema)
+
+    assert model.model_fields["address"].annotation is not address_model
+    assert model.model_validate({"address": {"city": "Paris"}})
+
+
+def test_create_model_from_schema_async_cached() -> None:
+    """Tests that the async variant shares the cache with the sync variant."""
+    schema = {
+        "type": "object",
+        "title": "Model",
+        "properties": {"name": {"type": "string"}},
+        "required": ["name"],
+    }
+
+    built = asyncio.run(schemaconverter.create_model_from_schema_async(schema))
+
+    assert schemaconverter.create_model_from_schema(schema) is built
+    assert asyncio.run(schemaconverter.create_model_from_schema_async(schema)) is built
+
+
+def test_create_model_from_schema_union_types() -> None:
+    """Tests the types of multi-type properties and that they are reused."""
+    schema = {
+        "type": "object",
+        "title": "Model",
+        "properties": {
+            "first": {"type": ["string", "integer", "null"]},
+            "second": {"type": ["string", "integer", "null"]},
+            "single": {"type": ["number"]},
+            "optional": {"type": ["boolean", "null"]},
+        },
+    }
+    schemaconverter._union_type.cache_clear()
+
+    model = schemaconverter.create_model_from_schema(schema)
+    annotations = {name: field.annotation for name, field in model.model_fields.items()}
+
+    assert annotations == {
+        "first": Optional[Union[str, int]],
+        "second": Optional[Union[str, int]],
+        "single": float,
+        "optional": Optional[bool],
+    }
+    cache_info = schemaconverter._union_type.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (1, 3)
+
+
+def test_create_model_from_schema_cache_distinguishes_bool_and_int() -> None:
+    """Tests that schemas differing only in true vs 1 get distinct models."""
+    schema_bool = {
+        "type": "object",
+        "title": "Model",
+        "properties": {"flag": {"type": "integer", "default": True}},
+    }
+    schema_int = {
+        "type": "object",
+        "title": "Model",
+        "properties": {"flag": {"type": "integer", "default": 1}},
+    }
+
+    model_bool = schemaconverter.create_model_from_schema(schema_bool)
+    model_int = schemaconverter.create_model_from_schema(schema_int)
+
+    assert model_bool is not model_int
+    assert model_bool.model_fields["flag"].default is True
+    assert type(model_int.model_fields["flag"].default) is int
+
+
+def test_create_model_from_schema_cache_distinguishes_non_finite_floats() -> None:
+    """Tests that schemas differing only in null, NaN or infinity differ."""
+    models = [
+        schemaconverter.create_model_from_schema(
+            {
+                "type": "object",
+                "title": "Model",
+                "properties": {"value": {"type": "number", "default": default}},
+            }
+        )
+        for default in (None, math.nan, math.inf, -math.inf)
+    ]
+    defaults = [model.model_fields["value"].default for model in models]
+
+    assert len(set(models)) == len(models)
+    assert defaults[0] is None
+    assert math.isnan(defaults[1])
+    assert defaults[2:] == [math.inf, -math.inf]
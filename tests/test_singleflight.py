@@ -0,0 +1,63 @@
+"""Unit tests for the single-flight deduplication."""
+
+import asyncio
+
+from cloaiservice.services import singleflight
+
+
+def test_single_flight_shares_concurrent_calls() -> None:
+    """Tests that concurrent calls with the same key run the function once."""
+    calls = 0
+
+    async def function() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run() -> list[int]:
+        flight = singleflight.SingleFlight()
+        return await asyncio.gather(*(flight.do("key", function) for _ in range(3)))
+
+    result = asyncio.run(run())
+
+    assert result == [1, 1, 1]
+    assert calls == 1
+
+
+def test_single_flight_releases_finished_calls() -> None:
+    """Tests that sequential calls with the same key each run the function."""
+    calls = 0
+
+    async def function() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def run() -> list[int]:
+        flight = singleflight.SingleFlight()
+        first = await flight.do("key", function)
+        await asyncio.sleep(0)
+        second = await flight.do("key", function)
+        return [first, second]
+
+    assert asyncio.run(run()) == [1, 2]
+
+
+def test_single_flight_propagates_errors() -> None:
+    """Tests that every caller receives the error of a shared call."""
+
+    async def function() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError
+
+    async def run() -> list[BaseException | None]:
+        flight = singleflight.SingleFlight()
+        return await asyncio.gather(
+            *(flight.do("key", function) for _ in range(2)), return_exceptions=True
+        )
+
+    result = asyncio.run(run())
+
+    assert len(result) == 2
+    assert all(isinstance(error, ValueError) for error in result)
@@ -0,0 +1,102 @@
+"""Unit tests for the streaming service."""
+
+import asyncio
+import types
+from collections.abc import AsyncIterator
+from typing import Any, TypeVar
+
+import cloai
+import pydantic
+import pytest
+from cloai.llm import utils
+
+from cloaiservice.services import streaming
+
+T = TypeVar("T")
+
+
+class _CompleteLlm(utils.LlmBaseClass):
+    """An LLM client without a streaming API."""
+
+    async def run(self, system_prompt: str, user_prompt: str) -> str:
+        return f"{system_prompt} {user_prompt}"
+
+    async def call_instructor(
+        self,
+        response_model: type[T],
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+    ) -> T:
+        pytest.fail("call_instructor should not be called.")
+
+
+async def _collect(chunks: AsyncIterator[T]) -> list[T]:
+    return [chunk async for chunk in chunks]
+
+
+def test_stream_run_fallback() -> None:
+    """Tests that clients without streaming yield the complete response."""
+    llm = cloai.LargeLanguageModel(client=_CompleteLlm())
+
+    result = asyncio.run(_collect(streaming.stream_run(llm, "system", "user")))
+
+    assert result == ["system user"]
+
+
+def test_stream_run_openai(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that OpenAI deltas are yielded and empty chunks are skipped."""
+    base_client = cloai.OpenAiLlm(model="gpt-4o", api_key="abc")
+    deltas = ["Hello", None, " world"]
+
+    async def create(**kwargs: Any) -> AsyncIterator[Any]:  # noqa: ANN401
+        assert kwargs["stream"] is True
+
+        async def chunks() -> AsyncIterator[Any]:
+            yield types.SimpleNamespace(choices=[])
+            for delta in deltas:
+                yield types.SimpleNamespace(
+                    choices=[
+                        types.SimpleNamespace(
+                            delta=types.SimpleNamespace(content=delta)
+                        )
+                    ]
+                )
+
+        return chunks()
+
+    monkeypatch.setattr(base_client.client.chat.completions, "create", create)
+    llm = cloai.LargeLanguageModel(client=base_client)
+
+    result = asyncio.run(_collect(streaming.stream_run(llm, "system", "user")))
+
+    assert result == ["Hello", " world"]
+
+
+def test_stream_instructor_openai(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that OpenAI partial models are yielded with the client's model."""
+
+    class Model(pydantic.BaseModel):
+        name: str | None = None
+
+    base_client = cloai.OpenAiLlm(model="gpt-4o", api_key="abc")
+    partials = [Model(), Model(name="Jo"), Model(name="John")]
+
+    async def create_partial(**kwargs: Any) -> AsyncIterator[Any]:  # noqa: ANN401
+        assert kwargs["model"] == "gpt-4o"
+        assert kwargs["messages"][0] == {"role": "system", "content": "system"}
+        for partial in partials:
+            yield partial
+
+    monkeypatch.setattr(
+        streaming._instructor_client(base_client),
+        "create_partial",
+        create_partial,
+    )
+    llm = cloai.LargeLanguageModel(client=base_client)
+
+    result = asyncio.run(
+        _collect(streaming.stream_instructor(llm, Model, "system", "user"))
+    )
+
+    assert result == partials